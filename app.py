@@ -1,16 +1,51 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response
 from logic import (
     solve_maze_bfs, solve_maze_dfs, solve_maze_astar,
     solve_puzzle_bfs, solve_puzzle_dfs, solve_puzzle_astar,
-    DEFAULT_MAZE
+    solve_maze_multi, maze_distance_matrix, DEFAULT_MAZE,
+    solve_maze_dls, solve_maze_iddfs, solve_puzzle_dls, solve_puzzle_iddfs,
+    maze_search_steps, puzzle_search_steps, PUZZLE_MAX_DEPTH
 )
-from levels import MAZE_LEVELS
+from level_pack import load_level_pack
+from maze_format import load_maze
+from hpa import solve_maze_hpa
+from wavefront import solve_maze_wavefront
+from scramble import scramble_puzzle
+import gzip
+import hashlib
 import json
 import os
 
 app = Flask(__name__)
 LEADERBOARD_FILE = 'leaderboard.json'
 
+# Levels are compiled once (python level_pack.py) and served from memory
+LEVEL_PACK = load_level_pack()
+LEVELS_MAX_AGE = 24 * 3600
+
+def precompute_json(obj):
+    body = json.dumps(obj, separators=(',', ':')).encode()
+    return {
+        'body': body,
+        'gzip': gzip.compress(body, 9),
+        'etag': hashlib.sha256(body).hexdigest()[:16],
+    }
+
+LEVELS_RESPONSE = precompute_json([lvl['maze'] for lvl in LEVEL_PACK['levels']])
+LEVEL_META_RESPONSE = precompute_json(
+    [{k: v for k, v in lvl.items() if k != 'maze'} for lvl in LEVEL_PACK['levels']])
+
+def cached_json(entry):
+    # Quality, not membership: 'gzip;q=0' means the client refuses gzip
+    use_gzip = request.accept_encodings['gzip'] > 0
+    resp = Response(entry['gzip'] if use_gzip else entry['body'], mimetype='application/json')
+    if use_gzip: resp.headers['Content-Encoding'] = 'gzip'
+    resp.headers['Vary'] = 'Accept-Encoding'
+    resp.set_etag(entry['etag'] + ('-gz' if use_gzip else ''))
+    resp.cache_control.public = True
+    resp.cache_control.max_age = LEVELS_MAX_AGE
+    return resp.make_conditional(request)
+
 def load_leaderboard():
     if not os.path.exists(LEADERBOARD_FILE): return []
     try:
@@ -26,7 +61,12 @@ def home():
 
 @app.route('/api/levels')
 def get_levels():
-    return jsonify(MAZE_LEVELS)
+    return cached_json(LEVELS_RESPONSE)
+
+@app.route('/api/levels/meta')
+def get_level_meta():
+    # Per level: dims, start/goal, optimal_length, reachable_cells, solution
+    return cached_json(LEVEL_META_RESPONSE)
 
 @app.route('/api/leaderboard', methods=['GET', 'POST'])
 def handle_leaderboard():
@@ -42,21 +82,145 @@ def handle_leaderboard():
         return jsonify({'status': 'saved'})
     return jsonify(scores)
 
+def request_maze(data):
+    """Inline grid or, for large mazes, a stored maze id (see maze_format.py).
+
+    Returns (maze, error_response); stored mazes must be closed by the caller.
+    """
+    maze_id = data.get('maze_id')
+    if maze_id is None:
+        return data.get('maze'), None
+    try:
+        return load_maze(maze_id), None
+    except ValueError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+    except KeyError:
+        return None, (jsonify({'error': 'Unknown maze id'}), 404)
+
+def close_maze(maze):
+    if hasattr(maze, 'close'): maze.close()
+
+def request_max_depth(data, default=None):
+    # default=None makes max_depth mandatory
+    max_depth = data.get('max_depth', default)
+    if max_depth is None:
+        raise ValueError('max_depth is required for this algorithm')
+    if isinstance(max_depth, bool) or not isinstance(max_depth, int) or max_depth < 0:
+        raise ValueError('max_depth must be a non-negative integer')
+    return max_depth
+
+def stream_steps(steps, on_close=None):
+    # NDJSON of path changes, not whole paths: {"limit": L} when a new depth
+    # limit starts (the path restarts empty), then {"pop": k, "push": node} per
+    # node entered (pop omitted when 0), and finally the result line
+    def generate():
+        limit, depth = None, 0
+        try:
+            while True:
+                try:
+                    step_limit, path = next(steps)
+                except StopIteration as stop:
+                    yield json.dumps(stop.value) + '\n'
+                    return
+                if step_limit != limit:
+                    limit, depth = step_limit, 0
+                    yield json.dumps({'limit': limit}) + '\n'
+                pops = depth - (len(path) - 1)
+                depth = len(path)
+                line = {'pop': pops, 'push': path[-1]} if pops else {'push': path[-1]}
+                yield json.dumps(line) + '\n'
+        finally:
+            if on_close: on_close()
+    return Response(generate(), mimetype='application/x-ndjson')
+
 @app.route('/api/solve/maze', methods=['POST'])
 def solve_maze():
     data = request.json
-    maze = data.get('maze')
     algorithm = data.get('algorithm')
-    
-    if algorithm == 'bfs':
-        result = solve_maze_bfs(maze)
-    elif algorithm == 'dfs':
-        result = solve_maze_dfs(maze)
-    elif algorithm == 'astar':
-        result = solve_maze_astar(maze)
-    else:
-        return jsonify({'error': 'Invalid algorithm'}), 400
-    
+    max_depth = None
+    if algorithm in ('dls', 'iddfs'):
+        # Path-only cycle checks are exponential in open mazes: the caller must bound them
+        try:
+            max_depth = request_max_depth(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    maze, error = request_maze(data)
+    if error: return error
+
+    if data.get('stream') and algorithm in ('dls', 'iddfs'):
+        try:
+            steps = maze_search_steps(maze, max_depth, iterative=(algorithm == 'iddfs'))
+        except ValueError as e:
+            close_maze(maze)
+            return jsonify({'error': str(e)}), 400
+        return stream_steps(steps, on_close=lambda: close_maze(maze))
+
+    try:
+        if algorithm == 'bfs':
+            result = solve_maze_bfs(maze)
+        elif algorithm == 'dfs':
+            result = solve_maze_dfs(maze)
+        elif algorithm == 'astar':
+            result = solve_maze_astar(maze)
+        elif algorithm == 'hpa':
+            result = solve_maze_hpa(maze)
+        elif algorithm == 'wavefront':
+            result = solve_maze_wavefront(maze)
+        elif algorithm == 'dls':
+            result = solve_maze_dls(maze, max_depth)
+        elif algorithm == 'iddfs':
+            result = solve_maze_iddfs(maze, max_depth)
+        else:
+            return jsonify({'error': 'Invalid algorithm'}), 400
+    finally:
+        close_maze(maze)
+
+    return jsonify(result)
+
+def is_position(item):
+    return (isinstance(item, list) and len(item) == 2
+            and all(isinstance(v, int) and not isinstance(v, bool) for v in item))
+
+def parse_positions(items, what):
+    if not isinstance(items, list) or not all(is_position(p) for p in items):
+        raise ValueError(f'{what} must be a list of [row, col] integer pairs')
+    return [tuple(p) for p in items]
+
+@app.route('/api/solve/maze/multi', methods=['POST'])
+def solve_maze_multi_route():
+    # data: {maze | maze_id, pairs: [[start, goal], ...], paths: bool}
+    #   or  {maze | maze_id, sources: [...], targets: [...]} for a distance matrix
+    data = request.json
+    try:
+        if 'pairs' in data:
+            pairs = data['pairs']
+            if not isinstance(pairs, list) or not all(
+                    isinstance(p, list) and len(p) == 2 and all(is_position(q) for q in p) for p in pairs):
+                raise ValueError('pairs must be a list of [[row, col], [row, col]] integer pairs')
+            pairs = [(tuple(s), tuple(g)) for s, g in pairs]
+        elif 'sources' in data and 'targets' in data:
+            sources = parse_positions(data['sources'], 'sources')
+            targets = parse_positions(data['targets'], 'targets')
+        else:
+            return jsonify({'error': 'Provide pairs or sources and targets'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    maze, error = request_maze(data)
+    if error: return error
+    if maze is None: return jsonify({'error': 'Provide maze or maze_id'}), 400
+
+    try:
+        if 'pairs' in data:
+            result = solve_maze_multi(maze, pairs, paths=bool(data.get('paths')))
+        else:
+            result = {'status': 'success', 'matrix': maze_distance_matrix(maze, sources, targets)}
+    except ValueError as e:
+        # Positions outside the maze
+        return jsonify({'error': str(e)}), 400
+    finally:
+        close_maze(maze)
+
     return jsonify(result)
 
 @app.route('/api/solve/puzzle', methods=['POST'])
@@ -69,6 +233,14 @@ def solve_puzzle():
     flat = [val for row in start_state for val in row]
     if sorted(flat) != list(range(9)):
          return jsonify({'error': 'Invalid puzzle state'}), 400
+    if algorithm in ('dls', 'iddfs'):
+        try:
+            max_depth = request_max_depth(data, PUZZLE_MAX_DEPTH)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+    if data.get('stream') and algorithm in ('dls', 'iddfs'):
+        return stream_steps(puzzle_search_steps(start_state, max_depth, iterative=(algorithm == 'iddfs')))
 
     if algorithm == 'bfs':
         result = solve_puzzle_bfs(start_state)
@@ -76,10 +248,32 @@ def solve_puzzle():
         result = solve_puzzle_dfs(start_state)
     elif algorithm == 'astar':
         result = solve_puzzle_astar(start_state)
+    elif algorithm == 'dls':
+        result = solve_puzzle_dls(start_state, max_depth)
+    elif algorithm == 'iddfs':
+        result = solve_puzzle_iddfs(start_state, max_depth)
     else:
         return jsonify({'error': 'Invalid algorithm'}), 400
         
     return jsonify(result)
 
+@app.route('/api/puzzle/scramble')
+def puzzle_scramble():
+    # ?depth=N -> random solvable board exactly N optimal moves from the goal
+    # no depth  -> uniformly random solvable board
+    depth = request.args.get('depth')
+    if depth is not None:
+        try:
+            depth = int(depth)
+        except ValueError:
+            return jsonify({'error': f'depth must be an integer between 0 and {PUZZLE_MAX_DEPTH}'}), 400
+    try:
+        state, depth = scramble_puzzle(depth)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    resp = jsonify({'state': state, 'depth': depth})
+    resp.cache_control.no_store = True
+    return resp
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
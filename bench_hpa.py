@@ -0,0 +1,70 @@
+import random
+import sys
+import time
+
+from logic import solve_maze_astar
+from hpa import get_hpa_graph, solve_maze_hpa, DEFAULT_CLUSTER_SIZE
+
+# Compares HPA* against flat A* on a random maze.
+# Usage: python bench_hpa.py [size] [queries] [cluster_size]
+
+
+def random_maze(size, wall_ratio=0.25, seed=0):
+    rng = random.Random(seed)
+    return [['1' if rng.random() < wall_ratio else '0' for _ in range(size)] for _ in range(size)]
+
+
+def random_open_cell(maze, rng):
+    while True:
+        r, c = rng.randrange(len(maze)), rng.randrange(len(maze[0]))
+        if maze[r][c] == '0':
+            return r, c
+
+
+def with_endpoints(maze, start, goal):
+    maze = [row[:] for row in maze]
+    maze[start[0]][start[1]] = 'S'
+    maze[goal[0]][goal[1]] = 'G'
+    return maze
+
+
+def main(size=200, queries=20, cluster_size=DEFAULT_CLUSTER_SIZE):
+    rng = random.Random(1)
+    maze = random_maze(size)
+
+    t0 = time.perf_counter()
+    # Warm the cache (what python hpa.py does for stored mazes) so queries below
+    # measure what API callers pay: find_pos + maze_hash + search + refinement
+    graph = get_hpa_graph(maze, cluster_size, build_limit=None)
+    build = time.perf_counter() - t0
+    print(f'{size}x{size} maze, cluster {cluster_size}: '
+          f'{len(graph.edges)} abstract nodes, built in {build:.3f}s')
+
+    astar_time = hpa_time = 0.0
+    ratios = []
+    for _ in range(queries):
+        start, goal = random_open_cell(maze, rng), random_open_cell(maze, rng)
+        grid = with_endpoints(maze, start, goal)
+
+        t0 = time.perf_counter()
+        flat = solve_maze_astar(grid)
+        astar_time += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        hier = solve_maze_hpa(grid, cluster_size)
+        hpa_time += time.perf_counter() - t0
+
+        if flat['status'] != hier['status']:
+            print(f'MISMATCH {start} -> {goal}: astar={flat["status"]} hpa={hier["status"]}')
+        elif flat['status'] == 'success':
+            ratios.append(len(hier['path']) / len(flat['path']))
+
+    print(f'astar: {astar_time / queries * 1000:.2f} ms/query')
+    print(f'hpa:   {hpa_time / queries * 1000:.2f} ms/query '
+          f'({astar_time / max(hpa_time, 1e-9):.1f}x faster)')
+    if ratios:
+        print(f'path length vs optimal: mean {sum(ratios) / len(ratios):.3f}, worst {max(ratios):.3f}')
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:4]))
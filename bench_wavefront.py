@@ -0,0 +1,37 @@
+import sys
+import time
+
+from logic import solve_maze_bfs
+from wavefront import solve_maze_wavefront
+
+# Throughput of the NumPy wavefront BFS vs solve_maze_bfs on an open grid.
+# Usage: python bench_wavefront.py [size]
+# The per-cell solver copies a path per node, so large sizes take minutes.
+
+
+def open_maze(size):
+    maze = [['0'] * size for _ in range(size)]
+    maze[0][0] = 'S'
+    maze[-1][-1] = 'G'
+    return maze
+
+
+def run(name, solver, maze):
+    t0 = time.perf_counter()
+    result = solver(maze)
+    elapsed = time.perf_counter() - t0
+    rate = len(result['visited']) / elapsed
+    print(f'{name:10} {elapsed:8.3f}s  {rate:12,.0f} cells/s  path {len(result["path"])}')
+    return rate
+
+
+def main(size=2000):
+    maze = open_maze(size)
+    print(f'{size}x{size} open grid')
+    fast = run('wavefront', solve_maze_wavefront, maze)
+    slow = run('bfs', solve_maze_bfs, maze)
+    print(f'speedup: {fast / slow:.1f}x')
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -10,12 +10,16 @@ from logic import (
     solve_puzzle_bfs, solve_puzzle_dfs, solve_puzzle_astar,
     get_maze_dims, DEFAULT_MAZE, GOAL_STATE_PUZZLE
 )
-from levels import MAZE_LEVELS
+from level_pack import load_level_pack
+from scramble import scramble_puzzle
+
+LEVELS = load_level_pack()['levels']
 
 # --- Constants & Config ---
 SCREEN_WIDTH = 1100
 SCREEN_HEIGHT = 750
 FPS = 60
+PUZZLE_SCRAMBLE_DEPTH = 20
 
 # Colors
 COLOR_BG = (15, 23, 42)
@@ -117,8 +121,8 @@ class GameState:
         
         # Maze
         self.current_level = 0
-        self.maze = copy.deepcopy(MAZE_LEVELS[0])
-        self.maze_player_pos = self.find_pos('S')
+        self.maze = copy.deepcopy(LEVELS[0]['maze'])
+        self.maze_player_pos = tuple(LEVELS[0]['start'])
         self.maze_algo = 'bfs'
         self.maze_visualizing = False
         self.maze_vis_steps = []
@@ -159,10 +163,11 @@ class GameState:
 
 
     def load_level(self, idx):
-        if idx >= len(MAZE_LEVELS): idx = 0 # Loop or stay at max
+        if idx >= len(LEVELS): idx = 0 # Loop or stay at max
         self.current_level = idx
-        self.maze = copy.deepcopy(MAZE_LEVELS[idx])
-        self.maze_player_pos = self.find_pos('S')
+        # Start position comes precomputed from the level pack
+        self.maze = copy.deepcopy(LEVELS[idx]['maze'])
+        self.maze_player_pos = tuple(LEVELS[idx]['start'])
         self.maze_timer_start = None
         self.maze_elapsed = 0
         self.maze_finished = False
@@ -184,7 +189,7 @@ class GameState:
             leaderboard.add_score(self.player_name, self.current_level + 1, self.maze_elapsed)
             self.player_name = "" # Reset
             # Go to next level
-            if self.current_level < len(MAZE_LEVELS) - 1:
+            if self.current_level < len(LEVELS) - 1:
                 self.load_level(self.current_level + 1)
                 self.mode = 'MAZE'
             else:
@@ -221,24 +226,8 @@ def run_puzzle_solve():
         gameState.puzzle_visualizing = True
 
 def run_puzzle_scramble():
-    import random
-    state = [list(r) for r in gameState.puzzle_state]
-    empty_r, empty_c = 2, 2
-    for r in range(3):
-        for c in range(3):
-            if state[r][c] == 0: empty_r, empty_c = r, c; break
-    for _ in range(100):
-        moves = []
-        if empty_r > 0: moves.append((-1, 0))
-        if empty_r < 2: moves.append((1, 0))
-        if empty_c > 0: moves.append((0, -1))
-        if empty_c < 2: moves.append((0, 1))
-        dr, dc = random.choice(moves)
-        nr, nc = empty_r + dr, empty_c + dc
-        state[empty_r][empty_c] = state[nr][nc]
-        state[nr][nc] = 0
-        empty_r, empty_c = nr, nc
-    gameState.puzzle_state = tuple(tuple(r) for r in state)
+    # Exactly PUZZLE_SCRAMBLE_DEPTH optimal moves from solved, not a blind random walk
+    gameState.puzzle_state, _ = scramble_puzzle(PUZZLE_SCRAMBLE_DEPTH)
 
 # --- Drawing ---
 
@@ -302,9 +291,14 @@ def draw_leaderboard(screen):
     screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 100))
     
     y = 200
-    for level in range(1, len(MAZE_LEVELS) + 1):
+    for level in range(1, len(LEVELS) + 1):
         lvl_title = FONT_TITLE.render(f"Level {level}", True, COLOR_PRIMARY)
         screen.blit(lvl_title, (100, y))
+
+        meta = LEVELS[level - 1]
+        stats = FONT_UI.render(f"{meta['rows']}x{meta['cols']} | optimal {meta['optimal_length']} steps | "
+                               f"{meta['reachable_cells']} reachable cells", True, COLOR_TEXT)
+        screen.blit(stats, (100 + lvl_title.get_width() + 20, y + 12))
         
         scores = leaderboard.get_top_scores(level)
         sy = y + 40
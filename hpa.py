@@ -0,0 +1,338 @@
+from array import array
+from collections import deque, OrderedDict
+import hashlib
+import heapq
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+from logic import find_pos, get_maze_dims, maze_heuristic, MAZE_MOVES
+
+# --- HIERARCHICAL PATHFINDING (HPA*) ---
+#
+# The maze is cut into cluster_size x cluster_size clusters. Wherever two
+# neighbouring clusters share open border cells we place entrance nodes, and
+# inside each cluster we precompute BFS distances between its entrances.
+# A query only searches this small abstract graph and then refines the chosen
+# abstract path cluster by cluster. Paths are near-optimal, not exact.
+
+DEFAULT_CLUSTER_SIZE = 16
+# Border segments at least this long get an entrance at both ends instead of one
+LONG_ENTRANCE = 6
+HPA_CACHE_SIZE = 8
+
+
+def maze_hash(maze):
+    """Hash of the wall layout only, so moving S/G reuses the same abstraction."""
+    rows, cols = get_maze_dims(maze)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f'{rows}x{cols}:'.encode())
+    cells = getattr(maze, 'cells', None)
+    if cells is not None:
+        h.update(bytes([maze.encoding]))
+        h.update(cells)
+        return h.hexdigest()
+    for row in maze:
+        h.update(''.join('1' if v == '1' else '0' for v in row).encode())
+    return h.hexdigest()
+
+
+def is_open(maze, r, c):
+    return maze[r][c] != '1'
+
+
+class HPAGraph:
+    # Cached graphs are shared between requests, so they never hold on to a
+    # maze: every method that reads cells takes the caller's maze instead.
+    def __init__(self, maze, cluster_size=DEFAULT_CLUSTER_SIZE):
+        self.k = cluster_size
+        self.rows, self.cols = get_maze_dims(maze)
+        self.edges = {}     # node -> {neighbour: cost}
+        self.clusters = {}  # (cr, cc) -> [entrance nodes]
+        self._build_entrances(maze)
+        for cluster, nodes in self.clusters.items():
+            self._build_intra_edges(maze, cluster, nodes)
+
+    def cluster_of(self, pos):
+        return pos[0] // self.k, pos[1] // self.k
+
+    def bounds(self, cluster):
+        r0, c0 = cluster[0] * self.k, cluster[1] * self.k
+        return r0, min(r0 + self.k, self.rows), c0, min(c0 + self.k, self.cols)
+
+    def _add_node(self, node):
+        if node not in self.edges:
+            self.edges[node] = {}
+            self.clusters.setdefault(self.cluster_of(node), []).append(node)
+
+    def _add_edge(self, a, b, cost):
+        self.edges[a][b] = cost
+        self.edges[b][a] = cost
+
+    def _add_segment(self, seg):
+        # seg: list of ((r1, c1), (r2, c2)) pairs straddling the border
+        picks = [seg[len(seg) // 2]] if len(seg) < LONG_ENTRANCE else [seg[0], seg[-1]]
+        for a, b in picks:
+            self._add_node(a)
+            self._add_node(b)
+            self._add_edge(a, b, 1)
+
+    def _scan_border(self, maze, pairs):
+        seg = []
+        for a, b in pairs:
+            if is_open(maze, *a) and is_open(maze, *b):
+                seg.append((a, b))
+            elif seg:
+                self._add_segment(seg)
+                seg = []
+        if seg: self._add_segment(seg)
+
+    def _build_entrances(self, maze):
+        k = self.k
+        # Each border between two neighbouring clusters is scanned on its own
+        for r in range(k - 1, self.rows - 1, k):
+            for c0 in range(0, self.cols, k):
+                self._scan_border(maze, [((r, c), (r + 1, c)) for c in range(c0, min(c0 + k, self.cols))])
+        for c in range(k - 1, self.cols - 1, k):
+            for r0 in range(0, self.rows, k):
+                self._scan_border(maze, [((r, c), (r, c + 1)) for r in range(r0, min(r0 + k, self.rows))])
+
+    def cluster_bfs(self, maze, source, cluster, target=None):
+        """BFS restricted to one cluster. Returns (dist, parent) dicts."""
+        r0, r1, c0, c1 = self.bounds(cluster)
+        dist = {source: 0}
+        parent = {source: None}
+        queue = deque([source])
+        while queue:
+            cur = queue.popleft()
+            if cur == target: break
+            x, y = cur
+            for dx, dy in MAZE_MOVES:
+                nx, ny = x + dx, y + dy
+                if r0 <= nx < r1 and c0 <= ny < c1 and (nx, ny) not in dist and is_open(maze, nx, ny):
+                    dist[(nx, ny)] = dist[cur] + 1
+                    parent[(nx, ny)] = cur
+                    queue.append((nx, ny))
+        return dist, parent
+
+    def _build_intra_edges(self, maze, cluster, nodes):
+        for i, a in enumerate(nodes):
+            dist, _ = self.cluster_bfs(maze, a, cluster)
+            for b in nodes[i + 1:]:
+                if b in dist:
+                    self._add_edge(a, b, dist[b])
+
+    def _endpoint_edges(self, maze, pos):
+        cluster = self.cluster_of(pos)
+        dist, _ = self.cluster_bfs(maze, pos, cluster)
+        return {n: dist[n] for n in self.clusters.get(cluster, []) if n in dist and n != pos}
+
+    def refine(self, maze, a, b):
+        """Concrete cells from a to b (exclusive of a) for one abstract edge."""
+        if self.cluster_of(a) != self.cluster_of(b):
+            return [b]
+        _, parent = self.cluster_bfs(maze, a, self.cluster_of(a), target=b)
+        segment = []
+        cur = b
+        while cur != a:
+            segment.append(cur)
+            cur = parent[cur]
+        segment.reverse()
+        return segment
+
+    def query(self, maze, start, goal):
+        if start == goal:
+            return {'status': 'success', 'path': [start], 'visited': [start]}
+
+        # Temporarily wire S and G into the abstract graph via an overlay
+        extra = {start: self._endpoint_edges(maze, start), goal: {}}
+        for n, d in self._endpoint_edges(maze, goal).items():
+            extra.setdefault(n, {})[goal] = d
+        if self.cluster_of(start) == self.cluster_of(goal):
+            dist, _ = self.cluster_bfs(maze, start, self.cluster_of(start), target=goal)
+            if goal in dist:
+                extra[start][goal] = dist[goal]
+
+        def neighbours(node):
+            yield from self.edges.get(node, {}).items()
+            yield from extra.get(node, {}).items()
+
+        pq = [(maze_heuristic(start, goal), 0, start)]
+        best = {start: 0}
+        parent = {start: None}
+        closed = set()
+        visited_history = []
+        while pq:
+            f, g, node = heapq.heappop(pq)
+            if node in closed: continue
+            closed.add(node)
+            visited_history.append(node)
+            if node == goal: break
+            for nbr, cost in neighbours(node):
+                ng = g + cost
+                if ng < best.get(nbr, float('inf')):
+                    best[nbr] = ng
+                    parent[nbr] = node
+                    heapq.heappush(pq, (ng + maze_heuristic(nbr, goal), ng, nbr))
+        else:
+            return {'status': 'not_found', 'visited': visited_history}
+
+        abstract = []
+        node = goal
+        while node is not None:
+            abstract.append(node)
+            node = parent[node]
+        abstract.reverse()
+
+        path = [start]
+        for a, b in zip(abstract, abstract[1:]):
+            path.extend(self.refine(maze, a, b))
+        return {'status': 'success', 'path': path, 'visited': visited_history}
+
+
+# --- SAVED ABSTRACTIONS ---
+#
+# Building the abstraction touches every cell, so big stored mazes get it
+# precomputed (python hpa.py) into a file next to their .ewmz:
+#   magic 'EWHP' | version u8 | pad | cluster u32 | rows u32 | cols u32 |
+#   wall hash 16 bytes | nodes u32 | edges u32
+# followed by int32 (r, c) per node and int32 (a, b, cost) per edge.
+
+HPA_MAGIC = b'EWHP'
+HPA_VERSION = 1
+HPA_HEADER = struct.Struct('<4sB3xIII16sII')
+# Larger mazes without a saved abstraction are refused rather than built
+# inside a request (1000x1000 takes ~20s)
+HPA_BUILD_LIMIT = 250_000
+
+
+def hpa_path(maze_file, cluster_size=DEFAULT_CLUSTER_SIZE):
+    return f'{os.path.splitext(maze_file)[0]}.k{cluster_size}.hpa'
+
+
+def save_hpa_graph(graph, path, wall_hash):
+    nodes = list(graph.edges)
+    index = {node: i for i, node in enumerate(nodes)}
+    node_data = array('i', (v for node in nodes for v in node))
+    edge_data = array('i')
+    for a, nbrs in graph.edges.items():
+        for b, cost in nbrs.items():
+            if index[a] < index[b]:
+                edge_data.extend((index[a], index[b], cost))
+    header = HPA_HEADER.pack(HPA_MAGIC, HPA_VERSION, graph.k, graph.rows, graph.cols,
+                             bytes.fromhex(wall_hash), len(nodes), len(edge_data) // 3)
+    directory = os.path.dirname(path) or '.'
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as f:
+        f.write(header)
+        node_data.tofile(f)
+        edge_data.tofile(f)
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, path)
+
+
+def load_hpa_graph(path, wall_hash, cluster_size):
+    """Saved abstraction at path, or None if missing or built from other walls."""
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return None
+    with f:
+        head = f.read(HPA_HEADER.size)
+        if len(head) < HPA_HEADER.size: return None
+        magic, version, k, rows, cols, digest, n_nodes, n_edges = HPA_HEADER.unpack(head)
+        if magic != HPA_MAGIC or version != HPA_VERSION or k != cluster_size or digest.hex() != wall_hash:
+            return None
+        node_data, edge_data = array('i'), array('i')
+        node_data.fromfile(f, 2 * n_nodes)
+        edge_data.fromfile(f, 3 * n_edges)
+    graph = HPAGraph.__new__(HPAGraph)
+    graph.k, graph.rows, graph.cols = k, rows, cols
+    graph.edges, graph.clusters = {}, {}
+    nodes = [(node_data[2*i], node_data[2*i+1]) for i in range(n_nodes)]
+    for node in nodes:
+        graph._add_node(node)
+    for i in range(0, len(edge_data), 3):
+        graph._add_edge(nodes[edge_data[i]], nodes[edge_data[i+1]], edge_data[i+2])
+    return graph
+
+
+def precompute_hpa(maze, cluster_size=DEFAULT_CLUSTER_SIZE):
+    """Builds and saves the abstraction next to a stored maze's .ewmz file."""
+    graph = HPAGraph(maze, cluster_size)
+    save_hpa_graph(graph, hpa_path(maze.path, cluster_size), maze_hash(maze))
+    return graph
+
+
+# --- CACHE ---
+
+_HPA_CACHE = OrderedDict()
+_HPA_CACHE_LOCK = threading.Lock()   # guards the two dicts, never held while building
+_HPA_KEY_LOCKS = {}                  # key -> lock held by whoever is loading that key
+
+
+def _load_or_build(maze, wall_hash, cluster_size, build_limit):
+    path = getattr(maze, 'path', None)
+    if path is not None:
+        graph = load_hpa_graph(hpa_path(path, cluster_size), wall_hash, cluster_size)
+        if graph is not None: return graph
+    rows, cols = get_maze_dims(maze)
+    if build_limit is not None and rows * cols > build_limit:
+        raise ValueError('Maze too large to build its HPA abstraction per request; '
+                         'store it and run python hpa.py <maze_id> first')
+    return HPAGraph(maze, cluster_size)
+
+
+def get_hpa_graph(maze, cluster_size=DEFAULT_CLUSTER_SIZE, build_limit=HPA_BUILD_LIMIT):
+    """Abstraction for this wall layout, loaded or built once and shared; query it with your own maze.
+
+    build_limit=None allows building any size (offline warm-up, benchmarks).
+    """
+    wall_hash = maze_hash(maze)
+    key = (wall_hash, cluster_size)
+    with _HPA_CACHE_LOCK:
+        graph = _HPA_CACHE.get(key)
+        if graph is not None:
+            _HPA_CACHE.move_to_end(key)
+            return graph
+        key_lock = _HPA_KEY_LOCKS.setdefault(key, threading.Lock())
+    # Only requests for this same maze wait here; other mazes keep being served
+    with key_lock:
+        with _HPA_CACHE_LOCK:
+            graph = _HPA_CACHE.get(key)
+        if graph is not None:
+            return graph
+        try:
+            graph = _load_or_build(maze, wall_hash, cluster_size, build_limit)
+        finally:
+            # Publish and drop the key lock together, so no one rebuilds in between
+            with _HPA_CACHE_LOCK:
+                if graph is not None:
+                    _HPA_CACHE[key] = graph
+                    if len(_HPA_CACHE) > HPA_CACHE_SIZE:
+                        _HPA_CACHE.popitem(last=False)
+                _HPA_KEY_LOCKS.pop(key, None)
+    return graph
+
+
+def solve_maze_hpa(maze, cluster_size=DEFAULT_CLUSTER_SIZE):
+    start = find_pos(maze, 'S')
+    goal = find_pos(maze, 'G')
+    if not start or not goal: return {'error': 'Start or Goal missing'}
+    try:
+        graph = get_hpa_graph(maze, cluster_size)
+    except ValueError as e:
+        return {'error': str(e)}
+    return graph.query(maze, start, goal)
+
+
+if __name__ == '__main__':
+    # python hpa.py                 -> precompute for every stored maze
+    # python hpa.py big level1      -> precompute for these maze ids
+    from maze_format import load_maze, MAZE_STORE_DIR, MAZE_EXT
+    ids = sys.argv[1:] or sorted(f[:-len(MAZE_EXT)] for f in os.listdir(MAZE_STORE_DIR) if f.endswith(MAZE_EXT))
+    for maze_id in ids:
+        with load_maze(maze_id) as maze:
+            graph = precompute_hpa(maze)
+            print(f'{maze_id} -> {hpa_path(maze.path)} ({len(graph.edges)} abstract nodes)')
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+from logic import open_mask, bfs_sweep, trace_back, get_maze_dims
+
+# --- LEVEL PACK BUILD ---
+#
+# Validates every level in levels.py once and writes a compiled artifact with
+# the grid plus precomputed metadata (dims, S/G, optimal length, reachable
+# cells, solution). The web app and the pygame client load this instead of
+# re-deriving anything per request.
+#
+#   python level_pack.py   -> build/levels.json
+
+BUILD_DIR = 'build'
+LEVEL_PACK_FILE = os.path.join(BUILD_DIR, 'levels.json')
+PACK_VERSION = 1
+
+
+def source_hash(levels):
+    return hashlib.sha256(json.dumps(levels, separators=(',', ':')).encode()).hexdigest()
+
+
+def compile_level(maze, idx):
+    rows, cols = get_maze_dims(maze)
+    found = {'S': [], 'G': []}
+    for r, row in enumerate(maze):
+        if len(row) != cols:
+            raise ValueError(f'Level {idx + 1}: row {r} has {len(row)} cells, expected {cols}')
+        for c, val in enumerate(row):
+            if val in found: found[val].append((r, c))
+            elif val not in ('0', '1'):
+                raise ValueError(f'Level {idx + 1}: invalid cell {val!r} at {(r, c)}')
+    for symbol, positions in found.items():
+        if len(positions) != 1:
+            raise ValueError(f'Level {idx + 1}: expected exactly one {symbol}, found {len(positions)}')
+    start, goal = found['S'][0], found['G'][0]
+
+    # One full sweep gives the solution and the reachable area at once
+    dist, parent = bfs_sweep(open_mask(maze), rows, cols, start[0] * cols + start[1])
+    goal_idx = goal[0] * cols + goal[1]
+    if goal_idx not in dist:
+        raise ValueError(f'Level {idx + 1}: goal is not reachable from start')
+    solution = trace_back(parent, cols, goal_idx)[::-1]
+
+    return {
+        'level': idx + 1,
+        'rows': rows,
+        'cols': cols,
+        'start': start,
+        'goal': goal,
+        'optimal_length': dist[goal_idx],
+        'reachable_cells': len(dist),
+        'solution': solution,
+        'maze': maze,
+    }
+
+
+def compile_levels(levels):
+    return {
+        'version': PACK_VERSION,
+        'source_hash': source_hash(levels),
+        'levels': [compile_level(maze, idx) for idx, maze in enumerate(levels)],
+    }
+
+
+def build_level_pack(path=LEVEL_PACK_FILE, levels=None):
+    if levels is None:
+        from levels import MAZE_LEVELS
+        levels = MAZE_LEVELS
+    pack = compile_levels(levels)
+    data = json.dumps(pack, separators=(',', ':')).encode()
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    # Several gunicorn workers may rebuild at once: each writes its own temp
+    # file, and the atomic replace leaves one complete artifact either way
+    with tempfile.NamedTemporaryFile(dir=directory, prefix='levels-', suffix='.tmp', delete=False) as f:
+        f.write(data)
+    # NamedTemporaryFile is 0600; the artifact must be readable by whoever serves it
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, path)
+    return pack
+
+
+def load_level_pack(path=LEVEL_PACK_FILE):
+    """Load the compiled pack, rebuilding it if missing or built from other levels."""
+    from levels import MAZE_LEVELS
+    try:
+        with open(path, 'r') as f: pack = json.load(f)
+    except (OSError, ValueError):
+        pack = None
+    if not pack or pack.get('version') != PACK_VERSION or pack.get('source_hash') != source_hash(MAZE_LEVELS):
+        pack = build_level_pack(path, MAZE_LEVELS)
+        pack = json.loads(json.dumps(pack))  # same shapes as a loaded file (lists, not tuples)
+    return pack
+
+
+if __name__ == '__main__':
+    pack = build_level_pack(sys.argv[1] if len(sys.argv) > 1 else LEVEL_PACK_FILE)
+    for lvl in pack['levels']:
+        print(f"Level {lvl['level']}: {lvl['rows']}x{lvl['cols']}, optimal {lvl['optimal_length']} steps, "
+              f"{lvl['reachable_cells']} reachable cells")
@@ -20,6 +20,8 @@ def get_maze_dims(maze):
     return len(maze), len(maze[0])
 
 def find_pos(maze, symbol):
+    # Mapped mazes (maze_format.MappedMaze) keep S/G in their header
+    if hasattr(maze, 'find_pos'): return maze.find_pos(symbol)
     rows, cols = get_maze_dims(maze)
     for i in range(rows):
         for j in range(cols):
@@ -125,6 +127,94 @@ def solve_maze_astar(maze):
     return {'status': 'not_found', 'visited': visited_history}
 
 
+# --- MULTI-QUERY MAZE LOGIC ---
+# Many (start, goal) pairs on one map. The grid is read once into a flat
+# open-cell mask, and pairs sharing an endpoint are answered by a single BFS
+# sweep from that endpoint (paths are reversible on an undirected grid).
+
+def open_mask(maze):
+    rows, cols = get_maze_dims(maze)
+    mask = bytearray(rows * cols)
+    for i in range(rows):
+        row = maze[i]
+        base = i * cols
+        for j in range(cols):
+            if row[j] != '1':
+                mask[base + j] = 1
+    return mask
+
+def bfs_sweep(mask, rows, cols, source, targets=None):
+    """BFS from one flat index until every target is reached (or the whole
+    component if targets is None). Returns (dist, parent) dicts keyed by flat
+    index, so an early exit only pays for the cells it actually reached."""
+    dist = {source: 0}
+    parent = {source: source}
+    remaining = set(targets) if targets is not None else None
+    if remaining is not None: remaining.discard(source)
+    queue = deque([source])
+    while queue and (remaining is None or remaining):
+        cur = queue.popleft()
+        x, y = divmod(cur, cols)
+        for dx, dy in MAZE_MOVES:
+            nx, ny = x+dx, y+dy
+            if 0 <= nx < rows and 0 <= ny < cols:
+                nxt = nx * cols + ny
+                if mask[nxt] and nxt not in dist:
+                    dist[nxt] = dist[cur] + 1
+                    parent[nxt] = cur
+                    if remaining is not None: remaining.discard(nxt)
+                    queue.append(nxt)
+    return dist, parent
+
+def trace_back(parent, cols, target):
+    path = [divmod(target, cols)]
+    while parent[target] != target:
+        target = parent[target]
+        path.append(divmod(target, cols))
+    return path
+
+def solve_maze_multi(maze, pairs, paths=False):
+    rows, cols = get_maze_dims(maze)
+    mask = open_mask(maze)
+    flat = []
+    for start, goal in pairs:
+        for x, y in (start, goal):
+            if not (0 <= x < rows and 0 <= y < cols):
+                raise ValueError(f'Position {(x, y)} is outside the maze')
+        flat.append((start[0] * cols + start[1], goal[0] * cols + goal[1]))
+
+    # Sweep from whichever side has fewer distinct endpoints
+    reverse = len({g for _, g in flat}) < len({s for s, _ in flat})
+    groups = {}
+    for idx, (s, g) in enumerate(flat):
+        src, dst = (g, s) if reverse else (s, g)
+        groups.setdefault(src, []).append((idx, dst))
+
+    distances = [None] * len(flat)
+    found = [None] * len(flat)
+    sweeps = 0
+    for src, queries in groups.items():
+        if not mask[src]: continue  # wall endpoint: nothing to sweep
+        sweeps += 1
+        dist, parent = bfs_sweep(mask, rows, cols, src, [dst for _, dst in queries])
+        for idx, dst in queries:
+            if dst not in dist: continue
+            distances[idx] = dist[dst]
+            if paths:
+                path = trace_back(parent, cols, dst)   # dst -> src
+                found[idx] = path if reverse else path[::-1]
+
+    result = {'status': 'success', 'distances': distances, 'sweeps': sweeps}
+    if paths: result['paths'] = found
+    return result
+
+def maze_distance_matrix(maze, sources, targets):
+    pairs = [(s, t) for s in sources for t in targets]
+    distances = solve_maze_multi(maze, pairs)['distances']
+    n = len(targets)
+    return [distances[i*n:(i+1)*n] for i in range(len(sources))]
+
+
 # --- 8-PUZZLE LOGIC ---
 
 GOAL_STATE_PUZZLE = ((1,2,3),
@@ -219,3 +309,135 @@ def solve_puzzle_astar(start):
                 heapq.heappush(pq,
                     (g + 1 + puzzle_heuristic(neighbor), g + 1, neighbor, path + [state]))
     return {'status': 'not_found', 'visited': visited_history}
+
+
+# --- DEPTH-BOUNDED DFS (MAZE & PUZZLE) ---
+# Depth-limited and iterative-deepening DFS. Only the current path is kept
+# (cycle checks are against the path, not a global visited set), so memory is
+# O(depth) instead of O(states). The live path can be streamed as it moves.
+
+# Every solvable 8-puzzle is at most 31 moves from the goal
+PUZZLE_MAX_DEPTH = 31
+# Path-only cycle checks enumerate every simple path, which explodes on open
+# mazes, so maze modes get a small default depth and every run a node budget
+MAZE_DFS_DEPTH = 64
+DFS_NODE_BUDGET = 1_000_000
+
+def dls_walk(start, is_goal, neighbors, limit):
+    """Depth-limited DFS generator.
+
+    Yields the live current path (copy it to keep it) each time a node is
+    entered and returns 'success', 'cutoff' or 'not_found'. On 'success' the
+    last yielded path ends at the goal.
+    """
+    path = [start]
+    on_path = {start}
+    yield path
+    if is_goal(start): return 'success'
+    stack = [iter(neighbors(start))] if limit > 0 else []
+    cutoff = limit == 0
+    while stack:
+        nxt = next(stack[-1], None)
+        if nxt is None:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if nxt in on_path: continue
+        path.append(nxt)
+        on_path.add(nxt)
+        yield path
+        if is_goal(nxt): return 'success'
+        if len(path) - 1 < limit:
+            stack.append(iter(neighbors(nxt)))
+        else:
+            cutoff = True
+            on_path.discard(path.pop())
+    return 'cutoff' if cutoff else 'not_found'
+
+def deepening_steps(start, is_goal, neighbors, max_depth, iterative=True, max_nodes=DFS_NODE_BUDGET):
+    """Runs DLS at max_depth, or IDDFS at limits 0..max_depth.
+
+    Yields (limit, path) for every node entered and returns the final result
+    dict. Gives up with a cutoff once max_nodes nodes have been entered in total.
+    """
+    status = 'not_found'
+    nodes = 0
+    for limit in (range(max_depth + 1) if iterative else [max_depth]):
+        walk = dls_walk(start, is_goal, neighbors, limit)
+        while True:
+            try:
+                path = next(walk)
+            except StopIteration as stop:
+                status = stop.value
+                break
+            nodes += 1
+            if max_nodes is not None and nodes > max_nodes:
+                return {'status': 'not_found', 'cutoff': True}
+            yield limit, path
+        if status == 'success':
+            return {'status': 'success', 'path': list(path), 'depth': len(path) - 1}
+        if status == 'not_found':
+            break  # nothing was cut off, a deeper limit cannot help
+    return {'status': 'not_found', 'cutoff': status == 'cutoff'}
+
+def finished_steps(result):
+    # A step generator that yields nothing and returns result straight away
+    return result
+    yield
+
+def run_deepening(steps, record=False):
+    """Drains a step generator. With record=True the entered nodes are kept in
+    'visited', which costs O(nodes) memory; use streaming to watch the search."""
+    visited_history = []
+    while True:
+        try:
+            _, path = next(steps)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        if record: visited_history.append(path[-1])
+    if record: result['visited'] = visited_history
+    return result
+
+def maze_search_steps(maze, max_depth=MAZE_DFS_DEPTH, iterative=True, max_nodes=DFS_NODE_BUDGET):
+    start = find_pos(maze, 'S')
+    goal = find_pos(maze, 'G')
+    if not start or not goal: raise ValueError('Start or Goal missing')
+
+    def neighbors(pos):
+        x, y = pos
+        return [(x+dx, y+dy) for dx, dy in MAZE_MOVES if is_valid(maze, x+dx, y+dy)]
+
+    return deepening_steps(start, lambda pos: pos == goal, neighbors, max_depth, iterative, max_nodes)
+
+def solve_maze_dls(maze, max_depth=MAZE_DFS_DEPTH, record=False, max_nodes=DFS_NODE_BUDGET):
+    try:
+        steps = maze_search_steps(maze, max_depth, False, max_nodes)
+    except ValueError as e:
+        return {'error': str(e)}
+    return run_deepening(steps, record)
+
+def solve_maze_iddfs(maze, max_depth=MAZE_DFS_DEPTH, record=False, max_nodes=DFS_NODE_BUDGET):
+    try:
+        steps = maze_search_steps(maze, max_depth, True, max_nodes)
+    except ValueError as e:
+        return {'error': str(e)}
+    return run_deepening(steps, record)
+
+def is_solvable_puzzle(state):
+    flat = [v for row in state for v in row if v != 0]
+    inversions = sum(1 for i in range(len(flat)) for j in range(i+1, len(flat)) if flat[i] > flat[j])
+    return inversions % 2 == 0
+
+def puzzle_search_steps(start, max_depth=PUZZLE_MAX_DEPTH, iterative=True, max_nodes=DFS_NODE_BUDGET):
+    # Unsolvable boards would otherwise exhaust every path up to max_depth
+    if not is_solvable_puzzle(start):
+        return finished_steps({'status': 'not_found', 'cutoff': False})
+    return deepening_steps(start, lambda s: s == GOAL_STATE_PUZZLE, get_neighbors,
+                           max_depth, iterative, max_nodes)
+
+def solve_puzzle_dls(start, max_depth=PUZZLE_MAX_DEPTH, record=False, max_nodes=DFS_NODE_BUDGET):
+    return run_deepening(puzzle_search_steps(start, max_depth, False, max_nodes), record)
+
+def solve_puzzle_iddfs(start, max_depth=PUZZLE_MAX_DEPTH, record=False, max_nodes=DFS_NODE_BUDGET):
+    return run_deepening(puzzle_search_steps(start, max_depth, True, max_nodes), record)
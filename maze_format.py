@@ -0,0 +1,219 @@
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+# --- BINARY MAZE FORMAT ---
+#
+# Header (little endian, 32 bytes):
+#   magic 'EWMZ' | version u8 | encoding u8 | pad u16 |
+#   rows u32 | cols u32 | start_r i32 | start_c i32 | goal_r i32 | goal_c i32
+# Body: one row after another. ENC_BYTE stores 1 byte per cell (0 open, 1 wall),
+# ENC_BIT stores 1 bit per cell, each row padded to a whole byte.
+# S and G live only in the header; their cells are stored as open.
+
+MAZE_MAGIC = b'EWMZ'
+MAZE_VERSION = 1
+ENC_BYTE = 0
+ENC_BIT = 1
+
+HEADER = struct.Struct('<4sBBHIIiiii')
+MAZE_STORE_DIR = 'mazes'
+MAZE_EXT = '.ewmz'
+MAZE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+def row_stride(cols, encoding):
+    return cols if encoding == ENC_BYTE else (cols + 7) // 8
+
+
+class MappedRow:
+    """Read-only view of one maze row, yielding the usual '0'/'1'/'S'/'G' chars."""
+
+    def __init__(self, maze, r):
+        self.maze = maze
+        self.r = r
+
+    def __len__(self):
+        return self.maze.cols
+
+    def __getitem__(self, c):
+        if c < 0: c += self.maze.cols
+        if not 0 <= c < self.maze.cols: raise IndexError(c)
+        return self.maze.cell(self.r, c)
+
+    def __iter__(self):
+        for c in range(self.maze.cols):
+            yield self.maze.cell(self.r, c)
+
+
+class MappedMaze:
+    """A maze backed by an mmap'd .ewmz file.
+
+    Indexes like the list-of-lists grids (maze[r][c]) so the solvers in
+    logic.py run on it unchanged, but nothing is copied out of the page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mm) < HEADER.size:
+            self.mm.close()
+            raise ValueError('Truncated maze file')
+        magic, version, encoding, _, rows, cols, sr, sc, gr, gc = HEADER.unpack_from(self.mm, 0)
+        if magic != MAZE_MAGIC or version != MAZE_VERSION or encoding not in (ENC_BYTE, ENC_BIT):
+            self.mm.close()
+            raise ValueError('Not a maze file')
+        self.encoding = encoding
+        self.rows, self.cols = rows, cols
+        self.stride = row_stride(cols, encoding)
+        if len(self.mm) < HEADER.size + rows * self.stride:
+            self.mm.close()
+            raise ValueError('Truncated maze file')
+        self.start = (sr, sc) if sr >= 0 else None
+        self.goal = (gr, gc) if gr >= 0 else None
+        self.cells = memoryview(self.mm)[HEADER.size:HEADER.size + rows * self.stride]
+
+    def close(self):
+        self.cells.release()
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        if r < 0: r += self.rows
+        if not 0 <= r < self.rows: raise IndexError(r)
+        return MappedRow(self, r)
+
+    def __iter__(self):
+        for r in range(self.rows):
+            yield MappedRow(self, r)
+
+    def is_wall(self, r, c):
+        if self.encoding == ENC_BYTE:
+            return self.cells[r * self.stride + c] != 0
+        return (self.cells[r * self.stride + (c >> 3)] >> (c & 7)) & 1 == 1
+
+    def cell(self, r, c):
+        if (r, c) == self.start: return 'S'
+        if (r, c) == self.goal: return 'G'
+        return '1' if self.is_wall(r, c) else '0'
+
+    def find_pos(self, symbol):
+        # S/G come straight from the header instead of a full grid scan
+        if symbol == 'S': return self.start
+        if symbol == 'G': return self.goal
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if self.cell(r, c) == symbol:
+                    return r, c
+        return None
+
+    def to_lists(self):
+        return [list(row) for row in self]
+
+
+def encode_maze(maze, encoding=ENC_BIT):
+    if not isinstance(maze, list) or not maze or not all(isinstance(row, list) for row in maze):
+        raise ValueError('Maze must be a non-empty list of rows')
+    rows, cols = len(maze), len(maze[0])
+    if cols == 0: raise ValueError('Maze rows must not be empty')
+    found = {'S': [], 'G': []}
+    stride = row_stride(cols, encoding)
+    body = bytearray(rows * stride)
+    for r in range(rows):
+        if len(maze[r]) != cols:
+            raise ValueError(f'Row {r} has {len(maze[r])} cells, expected {cols}')
+        base = r * stride
+        for c in range(cols):
+            val = maze[r][c]
+            if val in found: found[val].append((r, c))
+            elif val == '1':
+                if encoding == ENC_BYTE: body[base + c] = 1
+                else: body[base + (c >> 3)] |= 1 << (c & 7)
+            elif val != '0':
+                raise ValueError(f'Invalid maze cell {val!r} at {(r, c)}')
+    for symbol, positions in found.items():
+        if len(positions) != 1:
+            raise ValueError(f'Expected exactly one {symbol}, found {len(positions)}')
+    start, goal = found['S'][0], found['G'][0]
+    header = HEADER.pack(MAZE_MAGIC, MAZE_VERSION, encoding, 0, rows, cols,
+                         start[0], start[1], goal[0], goal[1])
+    return header + bytes(body)
+
+
+def write_maze(maze, path, encoding=ENC_BIT):
+    data = encode_maze(maze, encoding)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f: f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+def maze_path(maze_id, store_dir=MAZE_STORE_DIR):
+    if not isinstance(maze_id, str) or not MAZE_ID_RE.match(maze_id):
+        raise ValueError('Invalid maze id')
+    return os.path.join(store_dir, maze_id + MAZE_EXT)
+
+
+def load_maze(maze_id, store_dir=MAZE_STORE_DIR):
+    path = maze_path(maze_id, store_dir)
+    if not os.path.exists(path): raise KeyError(maze_id)
+    return MappedMaze(path)
+
+
+def save_maze(maze, maze_id, store_dir=MAZE_STORE_DIR, encoding=ENC_BIT):
+    os.makedirs(store_dir, exist_ok=True)
+    return write_maze(maze, maze_path(maze_id, store_dir), encoding)
+
+
+# --- CONVERTER ---
+
+def convert_levels(store_dir=MAZE_STORE_DIR, encoding=ENC_BIT):
+    from levels import MAZE_LEVELS
+    ids = []
+    for idx, maze in enumerate(MAZE_LEVELS):
+        maze_id = f'level{idx + 1}'
+        save_maze(maze, maze_id, store_dir, encoding)
+        ids.append(maze_id)
+    return ids
+
+
+def convert_json(json_path, maze_id=None, store_dir=MAZE_STORE_DIR, encoding=ENC_BIT):
+    with open(json_path, 'r') as f: data = json.load(f)
+    # Accept either a bare grid or a solve request body ({"maze": [...]})
+    if isinstance(data, dict):
+        if 'maze' not in data: raise ValueError(f'{json_path}: no "maze" key')
+        maze = data['maze']
+    else:
+        maze = data
+    if maze_id is None:
+        maze_id = os.path.splitext(os.path.basename(json_path))[0]
+    save_maze(maze, maze_id, store_dir, encoding)
+    return maze_id
+
+
+def main(argv):
+    # python maze_format.py                -> convert every level in levels.py
+    # python maze_format.py a.json b.json  -> convert JSON mazes, id = file name
+    encoding = ENC_BIT
+    if '--bytes' in argv:
+        encoding = ENC_BYTE
+        argv = [a for a in argv if a != '--bytes']
+    ids = [convert_json(p, encoding=encoding) for p in argv] if argv else convert_levels(encoding=encoding)
+    for maze_id in ids:
+        print(f'{maze_id} -> {maze_path(maze_id)}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
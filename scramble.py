@@ -0,0 +1,84 @@
+from array import array
+from bisect import bisect_right
+import random
+import threading
+
+from logic import GOAL_STATE_PUZZLE
+
+# --- PUZZLE SCRAMBLE INDEX ---
+#
+# One BFS from the goal visits all 181,440 solvable 8-puzzle boards in order of
+# optimal distance. Storing them in that order (as 9-digit ints) with the offset
+# where each depth starts gives O(1) sampling of a board at an exact depth, or
+# of a uniformly random solvable board.
+
+# For each blank position, the positions it can swap with
+BLANK_MOVES = [
+    [j for j in range(9) if abs(i // 3 - j // 3) + abs(i % 3 - j % 3) == 1]
+    for i in range(9)
+]
+
+
+class ScrambleIndex:
+    def __init__(self):
+        goal = ''.join(str(v) for row in GOAL_STATE_PUZZLE for v in row)
+        self.states = array('i')
+        self.offsets = [0]   # states[offsets[d]:offsets[d + 1]] are at depth d
+        seen = {goal}
+        layer = [goal]
+        while layer:
+            self.states.extend(int(s) for s in layer)
+            self.offsets.append(len(self.states))
+            nxt = []
+            for s in layer:
+                z = s.index('0')
+                for j in BLANK_MOVES[z]:
+                    cells = list(s)
+                    cells[z], cells[j] = cells[j], '0'
+                    t = ''.join(cells)
+                    if t not in seen:
+                        seen.add(t)
+                        nxt.append(t)
+            layer = nxt
+
+    @property
+    def max_depth(self):
+        return len(self.offsets) - 2
+
+    def count(self, depth):
+        return self.offsets[depth + 1] - self.offsets[depth]
+
+    def sample(self, depth=None, rng=random):
+        """Random solvable board exactly `depth` moves from the goal, or a uniformly
+        random solvable board if depth is None. Returns (state, depth)."""
+        if depth is None:
+            i = rng.randrange(len(self.states))
+            depth = bisect_right(self.offsets, i) - 1
+        else:
+            if not 0 <= depth <= self.max_depth:
+                raise ValueError(f'depth must be an integer between 0 and {self.max_depth}')
+            i = rng.randrange(self.offsets[depth], self.offsets[depth + 1])
+        return decode(self.states[i]), depth
+
+
+def decode(code):
+    digits = [int(c) for c in f'{code:09d}']
+    return tuple(tuple(digits[r*3:r*3+3]) for r in range(3))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_scramble_index():
+    """Builds the index on first use (about a second), then reuses it."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ScrambleIndex()
+    return _index
+
+
+def scramble_puzzle(depth=None, rng=random):
+    return get_scramble_index().sample(depth, rng)
@@ -14,6 +14,7 @@ const state = {
     playerName: "Guest",
     currentLevelIdx: 0,
     levels: [], // To be fetched
+    levelMeta: [], // Precomputed per-level stats (optimal length, reachable cells)
     mazeElapsedTime: 0,
     leaderboardInterval: null
 };
@@ -85,8 +86,9 @@ document.addEventListener('DOMContentLoaded', async () => {
 // --- Level Management ---
 async function loadLevels() {
     try {
-        const res = await fetch('/api/levels');
+        const [res, metaRes] = await Promise.all([fetch('/api/levels'), fetch('/api/levels/meta')]);
         state.levels = await res.json();
+        state.levelMeta = await metaRes.json();
     } catch (e) {
         console.error("Failed to load levels", e);
         // Fallback default
@@ -440,6 +442,14 @@ function renderLeaderboard(scores) {
         const lvlHeader = document.createElement('h3');
         lvlHeader.className = 'leaderboard-lvl-header';
         lvlHeader.textContent = `Level ${lvl}`;
+        const meta = state.levelMeta[lvl - 1];
+        if (meta) {
+            const stats = document.createElement('small');
+            stats.className = 'text-muted';
+            stats.style.marginLeft = '0.75rem';
+            stats.textContent = `${meta.rows}x${meta.cols} · optimal ${meta.optimal_length} steps · ${meta.reachable_cells} reachable cells`;
+            lvlHeader.appendChild(stats);
+        }
         lvlHeader.style.marginTop = '1.5rem';
         lvlHeader.style.color = 'var(--primary)';
         container.appendChild(lvlHeader);
@@ -520,9 +530,16 @@ function startPuzzleTimer() {
 }
 // Placeholder for full puzzle logic to match previous state if needed, but basic move works.
 function solvePuzzle() { alert("Puzzle solver backend connected but simplified here."); }
-function scramblePuzzle() {
-    // basic shuffle
-    state.puzzle = [[4, 1, 3], [7, 2, 5], [8, 0, 6]]; // Fixed scramble for check
+async function scramblePuzzle() {
+    // Random solvable board from the server; optional ?depth=N fixes its difficulty
+    try {
+        const res = await fetch('/api/puzzle/scramble');
+        const result = await res.json();
+        state.puzzle = result.state;
+    } catch (e) {
+        console.error("Failed to scramble puzzle", e);
+        state.puzzle = [[4, 1, 3], [7, 2, 5], [8, 0, 6]]; // Fallback board
+    }
     renderPuzzle(state.puzzle);
 }
 // Initialize Puzzle Board once
@@ -0,0 +1,90 @@
+import numpy as np
+
+from logic import find_pos, get_maze_dims, MAZE_MOVES
+from maze_format import ENC_BYTE
+
+# --- VECTORISED WAVEFRONT BFS ---
+#
+# On a 4-connected unit-cost grid BFS layers are just "open, unvisited cells
+# next to the previous layer". Each layer is expanded as one NumPy operation on
+# the flat indices of the frontier, so the per-cell Python loop disappears.
+
+
+def open_grid(maze):
+    """Boolean (rows, cols) array, True where the cell is not a wall."""
+    rows, cols = get_maze_dims(maze)
+    cells = getattr(maze, 'cells', None)
+    if cells is not None:
+        # MappedMaze: read straight from the mmap'd file
+        raw = np.frombuffer(cells, dtype=np.uint8).reshape(rows, maze.stride)
+        if maze.encoding == ENC_BYTE:
+            return raw == 0
+        return np.unpackbits(raw, axis=1, bitorder='little')[:, :cols] == 0
+    flat = ''.join(''.join(row) for row in maze).encode('ascii')
+    return (np.frombuffer(flat, dtype=np.uint8) != ord('1')).reshape(rows, cols)
+
+
+def wavefront_distances(grid, start, goal=None):
+    """Layered BFS over an open-cell grid.
+
+    Returns (dist, layers): dist is a (rows, cols) int32 array with -1 for
+    unreached cells, layers a list of flat-index arrays in discovery order.
+    Stops after the layer containing goal, if given.
+    """
+    rows, cols = grid.shape
+    open_flat = grid.ravel()
+    dist = np.full(rows * cols, -1, dtype=np.int32)
+    src = start[0] * cols + start[1]
+    dst = goal[0] * cols + goal[1] if goal is not None else -1
+    dist[src] = 0
+    frontier = np.array([src], dtype=np.int64)
+    layers = [frontier]
+    # Scratch array for de-duplicating a layer without sorting it
+    slot = np.empty(rows * cols, dtype=np.int64)
+    d = 0
+    while frontier.size:
+        if dst >= 0 and dist[dst] != -1: break
+        d += 1
+        col = frontier % cols
+        candidates = np.concatenate((
+            frontier[frontier >= cols] - cols,              # up
+            frontier[frontier < (rows - 1) * cols] + cols,  # down
+            frontier[col > 0] - 1,                          # left
+            frontier[col < cols - 1] + 1,                   # right
+        ))
+        candidates = candidates[open_flat[candidates] & (dist[candidates] == -1)]
+        ids = np.arange(candidates.size)
+        slot[candidates] = ids
+        frontier = candidates[slot[candidates] == ids]
+        dist[frontier] = d
+        if frontier.size: layers.append(frontier)
+    return dist.reshape(rows, cols), layers
+
+
+def backtrack(dist, goal):
+    rows, cols = dist.shape
+    path = [goal]
+    x, y = goal
+    for d in range(int(dist[goal]) - 1, -1, -1):
+        for dx, dy in MAZE_MOVES:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < rows and 0 <= ny < cols and dist[nx, ny] == d:
+                x, y = nx, ny
+                break
+        path.append((x, y))
+    path.reverse()
+    return path
+
+
+def solve_maze_wavefront(maze):
+    start = find_pos(maze, 'S')
+    goal = find_pos(maze, 'G')
+    if not start or not goal: return {'error': 'Start or Goal missing'}
+
+    dist, layers = wavefront_distances(open_grid(maze), start, goal)
+    # Layer-ordered visited cells, as (row, col) pairs for the animation
+    rs, cs = np.divmod(np.concatenate(layers), dist.shape[1])
+    visited = list(zip(rs.tolist(), cs.tolist()))
+    if dist[goal] == -1:
+        return {'status': 'not_found', 'visited': visited}
+    return {'status': 'success', 'path': backtrack(dist, goal), 'visited': visited}